@@ -4,27 +4,89 @@
 from __future__ import annotations
 
 import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import contextlib
 from datetime import datetime, timezone
+import functools
+import gzip
 import hashlib
+import http.client
 import json
 import mimetypes
 import os
 from pathlib import Path
+import queue
 import re
+import shutil
+import socket
+import sqlite3
+import stat
 import subprocess
+import tempfile
 import threading
 import time
 import urllib.parse
-import urllib.request
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from http import HTTPStatus
-from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    # Match orjson semantics: compact separators and raw UTF-8 instead of
+    # \uXXXX escapes, which also shrinks payloads with non-ASCII titles.
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def json_loads(raw):
+    if orjson is not None:
+        return orjson.loads(raw)
+    if isinstance(raw, (bytes, bytearray)):
+        raw = raw.decode("utf-8")
+    return _JSON_DECODER.decode(raw)
+
 
 ALLANIME_API = "https://api.allanime.day/api"
 ALLANIME_REFERER = "https://allanime.to"
 JIKAN_API = "https://api.jikan.moe/v4/anime"
+# Served when no cover can be resolved, so the client never branches on a
+# missing poster.
+NO_POSTER_URL = "https://placehold.co/600x900?text=No+Poster"
 USER_AGENT = "ani-cli-web-ui/2.0"
 VIDEO_EXTENSIONS = {".mp4", ".mkv", ".webm", ".mov", ".avi"}
+# Buffer size for the non-sendfile streaming fallback. Buffers are pooled
+# and reused across responses instead of allocating fresh bytes per read.
+MEDIA_CHUNK = 1 << 20
+_BUF_POOL: queue.SimpleQueue = queue.SimpleQueue()
+
+
+def _checkout_buffer() -> bytearray:
+    try:
+        return _BUF_POOL.get_nowait()
+    except queue.Empty:
+        return bytearray(MEDIA_CHUNK)
+
+
+# The server only ever hands out a handful of extensions; memoize the
+# mimetypes lookup per suffix.
+_MIME_CACHE: dict[str, str] = {}
+
+
+def mime_for_suffix(suffix: str, default: str) -> str:
+    ctype = _MIME_CACHE.get(suffix)
+    if ctype is None:
+        ctype = _MIME_CACHE[suffix] = mimetypes.guess_type("x" + suffix)[0] or default
+    return ctype
 
 SEARCH_QUERY = (
     "query( $search: SearchInput $limit: Int $page: Int "
@@ -32,21 +94,76 @@ SEARCH_QUERY = (
     "$countryOrigin: VaildCountryOriginEnumType ) { "
     "shows( search: $search limit: $limit page: $page "
     "translationType: $translationType countryOrigin: $countryOrigin ) { "
-    "edges { _id name availableEpisodes __typename } }}"
+    "edges { _id name availableEpisodes thumbnail __typename } }}"
 )
+# URL-encoded once; the GraphQL document never changes between requests.
+SEARCH_QUERY_ENC = urllib.parse.quote(SEARCH_QUERY, safe="")
 
 DOWNLOAD_DIR = Path(__file__).resolve().parent / "downloads"
 DOWNLOAD_DIR.mkdir(parents=True, exist_ok=True)
 POSTER_DIR = Path(__file__).resolve().parent / "posters"
 POSTER_DIR.mkdir(parents=True, exist_ok=True)
 BASE_DIR = Path(__file__).resolve().parent
-DOWNLOAD_LOCK = threading.Lock()
-HISTORY_FILE = Path(__file__).resolve().parent / "history.json"
+# Resolved once; per-request resolve() walks the filesystem for every path
+# component, which adds up on poster-heavy library renders.
+DOWNLOAD_ROOT = DOWNLOAD_DIR.resolve()
+POSTER_ROOT = POSTER_DIR.resolve()
+# Episode downloads run in per-request temp dirs, so they can overlap
+# safely; the semaphore just keeps ani-cli from saturating the link.
+DOWNLOAD_SEM = threading.BoundedSemaphore(int(os.environ.get("ANI_CLI_MAX_PARALLEL", "3")))
+HISTORY_FILE = Path(__file__).resolve().parent / "history.jsonl"
+LEGACY_HISTORY_FILE = Path(__file__).resolve().parent / "history.json"
 HISTORY_LOCK = threading.Lock()
+HISTORY_COMPACT_BYTES = 64 * 1024
+COVERS_DB = Path(__file__).resolve().parent / "covers.db"
+COVERS_TTL = 30 * 24 * 3600
+# A confirmed "Jikan has no cover" answer is retried hourly, not monthly;
+# a cover often appears shortly after a show is added.
+COVERS_NEGATIVE_TTL = 3600
+COVERS_LOCK = threading.Lock()
 EPISODE_NAME_RE = re.compile(r"^(?P<title>.+?)\s+Episode\s+(?P<ep>\d+)$", re.IGNORECASE)
 
 
-@dataclass(frozen=True)
+def split_episode_name(stem: str) -> tuple[str, int] | None:
+    """Split "Title Episode N" into (title, N), or None if it doesn't match.
+
+    The exact " Episode " spelling ani-cli produces is handled with plain
+    string ops; the regex only runs for case/spacing variants.
+    """
+    head, sep, tail = stem.rpartition(" Episode ")
+    if sep and tail.isdigit():
+        return head.strip(), int(tail)
+    match = EPISODE_NAME_RE.match(stem)
+    if match:
+        return match.group("title").strip(), int(match.group("ep"))
+    return None
+SLUG_RE = re.compile(r"[^a-zA-Z0-9]+")
+WHITESPACE_RE = re.compile(r"\s+")
+RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)")
+COVER_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="cover")
+
+STATIC_FILES = {
+    "index.html": "text/html; charset=utf-8",
+    "style.css": "text/css; charset=utf-8",
+    "script.js": "application/javascript; charset=utf-8",
+}
+
+
+def _build_static_cache() -> dict[str, tuple[str, bytes, bytes, str]]:
+    # Encode, gzip and tag the frontend assets once at import instead of
+    # reading and re-encoding them on every request.
+    cache: dict[str, tuple[str, bytes, bytes, str]] = {}
+    for filename, ctype in STATIC_FILES.items():
+        raw = (BASE_DIR / filename).read_bytes()
+        etag = f'"{hashlib.blake2b(raw, digest_size=16).hexdigest()}"'
+        cache[filename] = (ctype, raw, gzip.compress(raw, 9), etag)
+    return cache
+
+
+STATIC_CACHE = _build_static_cache()
+
+
+@dataclass(frozen=True, slots=True)
 class AnimeResult:
     id: str
     name: str
@@ -54,38 +171,131 @@ class AnimeResult:
     image_url: str
 
 
+_HTML_ESCAPE_TABLE = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"}
+)
+
+
+def html_escape(text: str) -> str:
+    # Single C-level pass instead of chained str.replace calls.
+    return text.translate(_HTML_ESCAPE_TABLE)
+
+
 def utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+# History lives in memory; each event is appended as one JSON line instead
+# of rewriting the whole file, and the file is compacted once it grows.
+_HISTORY_ITEMS: list[dict] | None = None
+
+
+def _read_history_file() -> list[dict]:
+    if HISTORY_FILE.exists():
+        try:
+            with HISTORY_FILE.open("rb") as f:
+                lines = deque(f, maxlen=10)
+        except OSError:
+            return []
+        items: list[dict] = []
+        for line in lines:
+            try:
+                item = json_loads(line)
+            except Exception:
+                continue
+            if isinstance(item, dict):
+                items.append(item)
+        return items
+
+    # Migrate from the pre-JSONL single-array format.
+    if LEGACY_HISTORY_FILE.exists():
+        try:
+            data = json_loads(LEGACY_HISTORY_FILE.read_bytes())
+        except Exception:
+            return []
+        if isinstance(data, list):
+            return data[-10:]
+    return []
+
+
 def load_history() -> list[dict]:
-    if not HISTORY_FILE.exists():
-        return []
-    try:
-        data = json.loads(HISTORY_FILE.read_text(encoding="utf-8"))
-    except Exception:
-        return []
-    if not isinstance(data, list):
-        return []
-    return data[-10:]
+    global _HISTORY_ITEMS
+    if _HISTORY_ITEMS is None:
+        _HISTORY_ITEMS = _read_history_file()
+    return _HISTORY_ITEMS
+
+
+def flush_history() -> None:
+    with HISTORY_LOCK:
+        if _HISTORY_ITEMS is not None:
+            save_history(_HISTORY_ITEMS)
 
 
 def save_history(items: list[dict]) -> None:
-    HISTORY_FILE.write_text(json.dumps(items, indent=2), encoding="utf-8")
+    HISTORY_FILE.write_bytes(b"".join(json_dumps(item) + b"\n" for item in items))
+
+
+# Encoded-response cache for the polled JSON endpoints; entries expire on a
+# short TTL and are dropped whenever a mutating endpoint records history.
+API_PAYLOAD_TTL = 5.0
+_API_PAYLOAD_CACHE: dict[str, tuple[float, bytes]] = {}
+_API_PAYLOAD_LOCK = threading.Lock()
+
+
+def cached_api_payload(key: str, build) -> bytes:
+    now = time.monotonic()
+    with _API_PAYLOAD_LOCK:
+        entry = _API_PAYLOAD_CACHE.get(key)
+        if entry is not None and now - entry[0] < API_PAYLOAD_TTL:
+            return entry[1]
+    raw = build()
+    with _API_PAYLOAD_LOCK:
+        _API_PAYLOAD_CACHE[key] = (now, raw)
+    return raw
+
+
+def invalidate_api_payloads() -> None:
+    with _API_PAYLOAD_LOCK:
+        _API_PAYLOAD_CACHE.clear()
 
 
 def append_history(event: str, details: dict) -> None:
+    record = {"time": utc_now_iso(), "event": event, "details": details}
+    if event == "download_season" and details.get("anime"):
+        # A season download carries a fresh episode count; drop the stale
+        # in-memory entry and overwrite the persisted one, which would
+        # otherwise keep answering with the old count.
+        key = normalize_title(details["anime"])
+        with _EPISODES_CACHE_LOCK:
+            _EPISODES_CACHE.pop(key, None)
+        episodes = int(details.get("episodes") or 0)
+        if episodes > 0:
+            _store_title_episodes(key, episodes)
+    invalidate_api_payloads()
     with HISTORY_LOCK:
         items = load_history()
-        items.append({"time": utc_now_iso(), "event": event, "details": details})
-        items = items[-10:]
-        save_history(items)
+        items.append(record)
+        del items[:-10]
+        try:
+            if not HISTORY_FILE.exists():
+                # First write after the legacy history.json migration (or a
+                # fresh install): persist the whole list, not just the new
+                # record, so the migrated items survive a restart.
+                save_history(items)
+            else:
+                with HISTORY_FILE.open("ab") as f:
+                    f.write(json_dumps(record) + b"\n")
+                if HISTORY_FILE.stat().st_size > HISTORY_COMPACT_BYTES:
+                    save_history(items)
+        except OSError:
+            pass
 
 
 def latest_history(limit: int = 10) -> list[dict]:
+    # Single reverse slice: newest-first tail in one copy, no intermediate
+    # forward slice + reversed() pass.
     with HISTORY_LOCK:
-        items = load_history()
-    return list(reversed(items[-limit:]))
+        return load_history()[-1 : -limit - 1 : -1]
 
 
 def history_summaries(limit: int = 10) -> list[dict]:
@@ -98,9 +308,9 @@ def history_summaries(limit: int = 10) -> list[dict]:
         episode = details.get("episode")
         if episode is None:
             filename = str(details.get("filename") or "")
-            match = EPISODE_NAME_RE.match(Path(filename).stem)
-            if match:
-                episode = int(match.group("ep"))
+            split = split_episode_name(Path(filename).stem)
+            if split is not None:
+                episode = split[1]
         if event == "play_episode":
             summary = f"Played {anime} episode {episode}"
         elif event == "play_downloaded_file":
@@ -120,91 +330,301 @@ def history_summaries(limit: int = 10) -> list[dict]:
     return output
 
 
+# Keep-alive connection pool for outbound HTTP. Every urlopen call used to
+# pay a fresh TCP+TLS handshake; reusing connections per host drops that to
+# roughly one handshake per worker.
+_HTTP_POOL: dict[tuple[str, str], list[http.client.HTTPConnection]] = {}
+_HTTP_POOL_LOCK = threading.Lock()
+_HTTP_POOL_PER_HOST = 8
+_REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+
+def _new_connection(scheme: str, host: str, timeout: int) -> http.client.HTTPConnection:
+    if scheme == "https":
+        return http.client.HTTPSConnection(host, timeout=timeout)
+    return http.client.HTTPConnection(host, timeout=timeout)
+
+
+def _checkout_connection(scheme: str, host: str, timeout: int) -> http.client.HTTPConnection:
+    with _HTTP_POOL_LOCK:
+        idle = _HTTP_POOL.get((scheme, host))
+        if idle:
+            conn = idle.pop()
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            return conn
+    return _new_connection(scheme, host, timeout)
+
+
+def _checkin_connection(scheme: str, host: str, conn: http.client.HTTPConnection, resp: http.client.HTTPResponse) -> None:
+    if resp.will_close or not resp.isclosed():
+        conn.close()
+        return
+    with _HTTP_POOL_LOCK:
+        idle = _HTTP_POOL.setdefault((scheme, host), [])
+        if len(idle) < _HTTP_POOL_PER_HOST:
+            idle.append(conn)
+            return
+    conn.close()
+
+
+@contextlib.contextmanager
+def http_get(url: str, headers: dict[str, str] | None = None, timeout: int = 25):
+    for _ in range(4):
+        parsed = urllib.parse.urlsplit(url)
+        target = parsed.path or "/"
+        if parsed.query:
+            target += "?" + parsed.query
+        conn = _checkout_connection(parsed.scheme, parsed.netloc, timeout)
+        try:
+            conn.request("GET", target, headers=headers or {})
+            resp = conn.getresponse()
+        except (http.client.HTTPException, OSError):
+            # Stale keep-alive connection; retry once on a fresh socket.
+            conn.close()
+            conn = _new_connection(parsed.scheme, parsed.netloc, timeout)
+            try:
+                conn.request("GET", target, headers=headers or {})
+                resp = conn.getresponse()
+            except Exception:
+                conn.close()
+                raise
+
+        location = resp.getheader("Location")
+        if resp.status in _REDIRECT_STATUSES and location:
+            resp.read()
+            _checkin_connection(parsed.scheme, parsed.netloc, conn, resp)
+            url = urllib.parse.urljoin(url, location)
+            continue
+        break
+    else:
+        # The last hop was checked in by the redirect branch above; bail out
+        # before the finally below could check the same connection in twice.
+        raise OSError(f"too many redirects for {url}")
+
+    try:
+        if resp.status >= 400:
+            resp.read()
+            raise OSError(f"HTTP {resp.status} for {url}")
+        yield resp
+    finally:
+        _checkin_connection(parsed.scheme, parsed.netloc, conn, resp)
+
+
 def fetch_json(url: str, headers: dict[str, str] | None = None, timeout: int = 25) -> dict:
-    req = urllib.request.Request(url, headers=headers or {})
-    with urllib.request.urlopen(req, timeout=timeout) as response:
-        return json.load(response)
+    with http_get(url, headers=headers, timeout=timeout) as response:
+        return json_loads(response.read())
 
 
 def search_anime(query: str, mode: str = "dub") -> list[AnimeResult]:
     if not query.strip():
         return []
+    # Bucket by minute so repeated searches skip the network but episode
+    # counts never go more than ~60s stale.
+    bucket = int(time.monotonic() // 60)
+    return list(_search_anime_cached(query, mode, bucket))
 
-    variables = {
-        "search": {"allowAdult": False, "allowUnknown": False, "query": query},
-        "limit": 20,
-        "page": 1,
-        "translationType": mode,
-        "countryOrigin": "ALL",
-    }
 
-    params = urllib.parse.urlencode(
-        {
-            "variables": json.dumps(variables, separators=(",", ":")),
-            "query": SEARCH_QUERY,
-        }
+@functools.lru_cache(maxsize=256)
+def _search_anime_cached(query: str, mode: str, bucket: int) -> tuple[AnimeResult, ...]:
+    # Covers are resolved lazily (per card via /api/cover, or progressively
+    # via the SSE stream) so a search costs a single AllAnime round-trip.
+    return tuple(_search_edges(query, mode))
+
+
+def _search_edges(query: str, mode: str) -> list[AnimeResult]:
+    # Only `query` and `mode` vary, so format the variables JSON in place
+    # instead of serializing a fresh dict per call.
+    variables = (
+        f'{{"search":{{"allowAdult":false,"allowUnknown":false,"query":{json.dumps(query)}}},'
+        f'"limit":20,"page":1,"translationType":{json.dumps(mode)},"countryOrigin":"ALL"}}'
     )
+    encoded_variables = urllib.parse.quote(variables, safe="")
 
     payload = fetch_json(
-        f"{ALLANIME_API}?{params}",
+        f"{ALLANIME_API}?variables={encoded_variables}&query={SEARCH_QUERY_ENC}",
         headers={"Referer": ALLANIME_REFERER, "User-Agent": USER_AGENT},
         timeout=20,
     )
 
     edges = payload.get("data", {}).get("shows", {}).get("edges", [])
-    raw_results: list[tuple[str, str, int]] = []
+    results: list[AnimeResult] = []
     for edge in edges:
-        anime_id = edge.get("_id")
-        name = edge.get("name")
-        episodes = int((edge.get("availableEpisodes", {}) or {}).get(mode, 0) or 0)
+        try:
+            anime_id = edge["_id"]
+            name = edge["name"]
+            episodes = int(edge["availableEpisodes"][mode] or 0)
+        except (KeyError, TypeError, ValueError):
+            continue
         if anime_id and name and episodes > 0:
-            raw_results.append((anime_id, name, episodes))
-
-    results: list[AnimeResult] = []
-    for anime_id, name, episodes in raw_results:
-        results.append(AnimeResult(id=anime_id, name=name, episodes=episodes, image_url=find_cover_image(name)))
+            # AllAnime's own thumbnail saves a Jikan round-trip per result;
+            # relative paths are skipped so Jikan stays the fallback.
+            thumbnail = edge.get("thumbnail") or ""
+            if not thumbnail.startswith("http"):
+                thumbnail = ""
+            results.append(AnimeResult(id=anime_id, name=name, episodes=episodes, image_url=thumbnail))
     return results
 
 
+def _open_covers_db() -> sqlite3.Connection:
+    conn = sqlite3.connect(COVERS_DB, check_same_thread=False)
+    conn.execute("CREATE TABLE IF NOT EXISTS covers(title TEXT PRIMARY KEY, url TEXT, ts INTEGER)")
+    conn.commit()
+    return conn
+
+
+_COVERS_CONN = _open_covers_db()
+
+
 def find_cover_image(title: str) -> str:
-    params = urllib.parse.urlencode({"q": title, "limit": 1, "sfw": "true"})
+    # Normalize so "My Show" and "my  show" share a cache entry.
+    return _find_cover_image_cached(normalize_title(title))
+
+
+# In-process cache for resolved cover URLs; only non-empty results enter
+# it, so misses and transient failures can retry (the sqlite layer gives
+# true misses their own short TTL).
+_COVER_URL_CACHE: dict[str, str] = {}
+_COVER_URL_CACHE_MAX = 2048
+
+
+def _find_cover_image_cached(title: str) -> str:
+    cached = _COVER_URL_CACHE.get(title)
+    if cached:
+        return cached
+    now = int(time.time())
+    with COVERS_LOCK:
+        row = _COVERS_CONN.execute("SELECT url, ts FROM covers WHERE title = ?", (title,)).fetchone()
+    if row is not None:
+        url = row[0]
+        if now - row[1] < (COVERS_TTL if url else COVERS_NEGATIVE_TTL):
+            if url:
+                _remember_cover_url(title, url)
+            return url
+
     try:
-        payload = fetch_json(f"{JIKAN_API}?{params}", headers={"User-Agent": USER_AGENT}, timeout=8)
+        url = _fetch_cover_image(title)
     except Exception:
+        # Timeout, DNS failure, upstream 5xx: record nothing so the next
+        # call retries instead of serving a month-long negative entry.
         return ""
-    entries = payload.get("data") or []
-    if not entries:
+    with COVERS_LOCK:
+        _COVERS_CONN.execute("INSERT OR REPLACE INTO covers(title, url, ts) VALUES (?, ?, ?)", (title, url, now))
+        _COVERS_CONN.commit()
+    if url:
+        _remember_cover_url(title, url)
+    return url
+
+
+def _remember_cover_url(title: str, url: str) -> None:
+    # Bounded because the keys include raw query strings from the open API
+    # endpoints; wholesale reset is fine at this size since sqlite still
+    # answers evicted titles without a network round-trip.
+    if len(_COVER_URL_CACHE) >= _COVER_URL_CACHE_MAX:
+        _COVER_URL_CACHE.clear()
+    _COVER_URL_CACHE[title] = url
+
+
+def _fetch_cover_image(title: str) -> str:
+    """Jikan lookup; raises on request failure, returns "" for a true miss."""
+    params = urllib.parse.urlencode({"q": title, "limit": 1, "sfw": "true"})
+    payload = fetch_json(f"{JIKAN_API}?{params}", headers={"User-Agent": USER_AGENT}, timeout=8)
+    try:
+        return payload["data"][0]["images"]["jpg"]["image_url"] or ""
+    except (KeyError, IndexError, TypeError):
         return ""
-    return (((entries[0].get("images") or {}).get("jpg") or {}).get("image_url")) or ""
 
 
+# Titles recur constantly (history scans, cache keys, match loops), so
+# normalization is memoized; bounded because the input includes raw query
+# strings from the open API endpoints.
+@functools.lru_cache(maxsize=4096)
 def normalize_title(title: str) -> str:
-    return re.sub(r"\s+", " ", title.strip().lower())
+    return WHITESPACE_RE.sub(" ", title.strip().lower())
 
 
-def best_search_match(query: str, results: list[AnimeResult]) -> AnimeResult | None:
+def best_search_match(query: str, results: list[AnimeResult]) -> tuple[int, AnimeResult] | None:
+    """Return (index, result) so callers don't need a second linear scan."""
     if not results:
         return None
     wanted = normalize_title(query)
-    for item in results:
-        if normalize_title(item.name) == wanted:
-            return item
-    for item in results:
-        name = normalize_title(item.name)
+    normalized = [(normalize_title(item.name), item) for item in results]
+    for i, (name, item) in enumerate(normalized):
+        if name == wanted:
+            return i, item
+    for i, (name, item) in enumerate(normalized):
         if wanted in name or name in wanted:
-            return item
-    return results[0]
+            return i, item
+    return 0, results[0]
+
+
+EPISODES_CACHE_TTL = 24 * 3600
+_EPISODES_CACHE: dict[str, tuple[float, int]] = {}
+_EPISODES_CACHE_LOCK = threading.Lock()
 
+TITLE_EPISODES_FILE = BASE_DIR / "title_episodes.json"
+_TITLE_EPISODES: dict[str, int] | None = None
+_TITLE_EPISODES_LOCK = threading.Lock()
 
-def infer_total_episodes(title: str) -> int:
+
+def _title_episodes() -> dict[str, int]:
+    # Called under _TITLE_EPISODES_LOCK.
+    global _TITLE_EPISODES
+    if _TITLE_EPISODES is None:
+        try:
+            data = json_loads(TITLE_EPISODES_FILE.read_bytes())
+            _TITLE_EPISODES = {str(k): int(v) for k, v in data.items()} if isinstance(data, dict) else {}
+        except Exception:
+            _TITLE_EPISODES = {}
+    return _TITLE_EPISODES
+
+
+def _store_title_episodes(key: str, episodes: int) -> None:
+    with _TITLE_EPISODES_LOCK:
+        cache = _title_episodes()
+        cache[key] = episodes
+        tmp = TITLE_EPISODES_FILE.with_name(TITLE_EPISODES_FILE.name + ".tmp")
+        try:
+            tmp.write_bytes(json_dumps(cache))
+            os.replace(tmp, TITLE_EPISODES_FILE)
+        except Exception:
+            pass
+
+
+def infer_total_episodes(title: str, known_episodes: int = 0, history_snapshot: list[dict] | None = None) -> int:
+    """Best-known total episode count; `known_episodes` invalidates stale caches."""
+    key = normalize_title(title)
+    now = time.monotonic()
+    with _EPISODES_CACHE_LOCK:
+        entry = _EPISODES_CACHE.get(key)
+        if entry is not None and now - entry[0] < EPISODES_CACHE_TTL and entry[1] >= known_episodes:
+            return entry[1]
+
+    with _TITLE_EPISODES_LOCK:
+        episodes = _title_episodes().get(key, 0)
+    if episodes < known_episodes or episodes <= 0:
+        episodes = _infer_total_episodes(title, history_snapshot=history_snapshot)
+        if episodes > 0:
+            _store_title_episodes(key, episodes)
+    if episodes > 0:
+        with _EPISODES_CACHE_LOCK:
+            _EPISODES_CACHE[key] = (now, episodes)
+    return episodes
+
+
+def _infer_total_episodes(title: str, history_snapshot: list[dict] | None = None) -> int:
     cached = 0
-    with HISTORY_LOCK:
-        for item in load_history():
-            details = item.get("details") or {}
-            anime = str(details.get("anime") or "")
-            episodes = int(details.get("episodes") or 0)
-            if normalize_title(anime) == normalize_title(title) and episodes > cached:
-                cached = episodes
+    wanted = normalize_title(title)
+    if history_snapshot is None:
+        with HISTORY_LOCK:
+            history_snapshot = list(load_history())
+    for item in history_snapshot:
+        details = item.get("details") or {}
+        anime = str(details.get("anime") or "")
+        episodes = int(details.get("episodes") or 0)
+        if normalize_title(anime) == wanted and episodes > cached:
+            cached = episodes
     if cached > 0:
         return cached
 
@@ -215,10 +635,13 @@ def infer_total_episodes(title: str) -> int:
             continue
         match = best_search_match(title, results)
         if match is not None:
-            return match.episodes
+            return match[1].episodes
     return 0
 
 
+POSTER_EXTENSIONS = (".jpg", ".png", ".webp", ".jpeg", ".gif")
+
+
 def ext_for_content_type(content_type: str) -> str:
     if "png" in content_type:
         return ".png"
@@ -227,30 +650,73 @@ def ext_for_content_type(content_type: str) -> str:
     return ".jpg"
 
 
-def ensure_local_poster(title: str, image_url: str = "") -> str:
-    slug = re.sub(r"[^a-zA-Z0-9]+", "-", title.strip().lower()).strip("-") or "poster"
-    base = f"{slug}-{hashlib.sha1(title.encode('utf-8')).hexdigest()[:8]}"
+def client_image_url(value) -> str:
+    """Client-echoed image URL, with the no-poster placeholder stripped.
+
+    The search stream substitutes NO_POSTER_URL for cover misses and the
+    client echoes it back in POST bodies; treating it as a real source
+    would persist the placeholder as a poster and shadow a later cover.
+    """
+    url = str(value or "").strip()
+    return "" if url == NO_POSTER_URL else url
+
+
+_POSTER_URL_CACHE: dict[str, str] = {}
+_POSTER_URL_CACHE_MAX = 2048
 
-    existing = next(POSTER_DIR.glob(f"{base}.*"), None)
-    if existing is not None and existing.is_file():
-        return "/poster/" + urllib.parse.quote(existing.name)
+
+def ensure_local_poster(title: str, image_url: str = "") -> str:
+    # Only successful resolutions are cached so a failed fetch can retry.
+    # Bounded because titles arrive from the open POST endpoints; evicted
+    # entries re-resolve from the on-disk filename probe without a refetch.
+    cached = _POSTER_URL_CACHE.get(title)
+    if cached:
+        return cached
+    url = _ensure_local_poster(title, image_url)
+    if url:
+        if len(_POSTER_URL_CACHE) >= _POSTER_URL_CACHE_MAX:
+            _POSTER_URL_CACHE.clear()
+        _POSTER_URL_CACHE[title] = url
+    return url
+
+
+def _ensure_local_poster(title: str, image_url: str = "") -> str:
+    slug = SLUG_RE.sub("-", title.strip().lower()).strip("-") or "poster"
+    title_bytes = title.encode("utf-8")
+    # blake2b is a non-cryptographic filename tag here; digest_size=4 yields
+    # the 8 hex chars directly. Keep checking the old sha1-based name so
+    # posters cached by earlier versions aren't refetched.
+    base = f"{slug}-{hashlib.blake2b(title_bytes, digest_size=4).hexdigest()}"
+    legacy_base = f"{slug}-{hashlib.sha1(title_bytes).hexdigest()[:8]}"
+
+    # Probe the handful of possible names directly rather than globbing,
+    # which reads the whole posters directory per call.
+    for name in (base, legacy_base):
+        for ext in POSTER_EXTENSIONS:
+            candidate = POSTER_DIR / f"{name}{ext}"
+            if candidate.is_file():
+                return "/poster/" + urllib.parse.quote(candidate.name)
 
     src = image_url or find_cover_image(title)
     if not src:
         return ""
 
+    # Stream the body straight to a temp file and rename into place, so big
+    # posters never sit fully in memory and half-written files never leak
+    # into the served directory.
+    tmp: Path | None = None
     try:
-        req = urllib.request.Request(src, headers={"User-Agent": USER_AGENT})
-        with urllib.request.urlopen(req, timeout=12) as resp:
-            data = resp.read()
-            ext = ext_for_content_type((resp.headers.get("Content-Type") or "").lower())
-    except Exception:
-        return ""
-
-    target = POSTER_DIR / f"{base}{ext}"
-    try:
-        target.write_bytes(data)
+        with http_get(src, headers={"User-Agent": USER_AGENT}, timeout=12) as resp:
+            ext = ext_for_content_type((resp.getheader("Content-Type") or "").lower())
+            target = POSTER_DIR / f"{base}{ext}"
+            tmp = POSTER_DIR / f".{base}{ext}.tmp"
+            with tmp.open("wb") as fh:
+                shutil.copyfileobj(resp, fh, 65536)
+            os.replace(tmp, target)
     except Exception:
+        if tmp is not None:
+            with contextlib.suppress(OSError):
+                tmp.unlink()
         return ""
     return "/poster/" + urllib.parse.quote(target.name)
 
@@ -265,55 +731,50 @@ def build_ani_cmd(query: str, mode: str, search_index: int, episode_expr: str, d
     return cmd
 
 
-def media_snapshot() -> dict[Path, float]:
-    snap: dict[Path, float] = {}
-    for item in DOWNLOAD_DIR.iterdir():
-        if item.is_file() and item.suffix.lower() in VIDEO_EXTENSIONS:
-            snap[item] = item.stat().st_mtime
-    return snap
-
-
-def detect_downloaded_file(before: dict[Path, float], started_at: float) -> Path | None:
-    after = media_snapshot()
-    new_files = [p for p in after if p not in before]
-    if new_files:
-        return max(new_files, key=lambda p: after[p])
-
-    updated = [p for p, mtime in after.items() if p in before and mtime > before[p]]
-    if updated:
-        return max(updated, key=lambda p: after[p])
-
-    recent = [p for p, mtime in after.items() if mtime >= started_at - 1]
-    if recent:
-        return max(recent, key=lambda p: after[p])
-
-    return None
+def collect_downloaded_file(tmp_dir: Path) -> Path | None:
+    candidates = [p for p in tmp_dir.iterdir() if p.is_file() and p.suffix.lower() in VIDEO_EXTENSIONS]
+    if not candidates:
+        return None
+    produced = max(candidates, key=lambda p: p.stat().st_size)
+    final = DOWNLOAD_DIR / produced.name
+    os.replace(produced, final)
+    return final
 
 
 def download_episode_for_browser(query: str, mode: str, search_index: int, episode: int) -> tuple[bool, str, Path | None]:
     cmd = build_ani_cmd(query, mode, search_index, str(episode), download=True)
-    before = media_snapshot()
-    started = time.time()
 
     env = os.environ.copy()
-    env["ANI_CLI_DOWNLOAD_DIR"] = str(DOWNLOAD_DIR)
+    # A per-invocation directory makes the produced file unambiguous without
+    # scanning the whole library, and keeps concurrent downloads apart.
+    tmp_dir = Path(tempfile.mkdtemp(prefix=".ani-dl-", dir=DOWNLOAD_DIR))
+    env["ANI_CLI_DOWNLOAD_DIR"] = str(tmp_dir)
 
     try:
-        completed = subprocess.run(cmd, cwd=str(DOWNLOAD_DIR), env=env, capture_output=True, text=True)
-    except FileNotFoundError:
-        return False, "ani-cli is not installed or not in PATH", None
-    except Exception as exc:
-        return False, str(exc), None
-
-    if completed.returncode != 0:
-        err = (completed.stderr or completed.stdout or "download failed").strip()
-        return False, err, None
-
-    video_file = detect_downloaded_file(before, started)
-    if video_file is None:
-        return False, "download finished but output file was not detected", None
-
-    return True, f"Downloaded episode {episode}", video_file
+        try:
+            proc = subprocess.Popen(cmd, cwd=str(tmp_dir), env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        except FileNotFoundError:
+            return False, "ani-cli is not installed or not in PATH", None
+        except Exception as exc:
+            return False, str(exc), None
+
+        # Drain stderr as it arrives, keeping only the tail for diagnostics;
+        # buffering ani-cli's full progress output can cost tens of MB.
+        stderr_tail: deque[bytes] = deque(maxlen=64)
+        if proc.stderr is not None:
+            for line in proc.stderr:
+                stderr_tail.append(line)
+        if proc.wait() != 0:
+            err = b"".join(stderr_tail).decode("utf-8", "replace").strip() or "download failed"
+            return False, err, None
+
+        video_file = collect_downloaded_file(tmp_dir)
+        if video_file is None:
+            return False, "download finished but output file was not detected", None
+
+        return True, f"Downloaded episode {episode}", video_file
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
 
 
 def start_background_season_download(query: str, mode: str, search_index: int, episodes: int) -> tuple[bool, str]:
@@ -342,65 +803,107 @@ def start_background_season_download_by_title(title: str, mode: str = "dub") ->
     match = best_search_match(query, results)
     if match is None:
         return False, f"no usable match for {query}", 0
-    episodes = match.episodes
-    ok, msg = start_background_season_download(query=title, mode=mode, search_index=results.index(match) + 1, episodes=episodes)
+    index, result = match
+    episodes = result.episodes
+    ok, msg = start_background_season_download(query=title, mode=mode, search_index=index + 1, episodes=episodes)
     if not ok:
         return False, msg, 0
     return True, msg, episodes
 
 
+_LIBRARY_CACHE: dict = {"dir_mtime_ns": -1, "groups": None}
+_LIBRARY_CACHE_LOCK = threading.Lock()
+
+
 def list_library_groups() -> list[dict]:
+    # The groups only change when DOWNLOAD_DIR does; gate the rebuild on the
+    # directory mtime so repeat library loads skip the scan entirely.
+    try:
+        dir_mtime_ns = DOWNLOAD_DIR.stat().st_mtime_ns
+    except OSError:
+        dir_mtime_ns = -1
+    with _LIBRARY_CACHE_LOCK:
+        if _LIBRARY_CACHE["groups"] is not None and _LIBRARY_CACHE["dir_mtime_ns"] == dir_mtime_ns:
+            return _LIBRARY_CACHE["groups"]
+
+    groups = _build_library_groups()
+    with _LIBRARY_CACHE_LOCK:
+        _LIBRARY_CACHE["dir_mtime_ns"] = dir_mtime_ns
+        _LIBRARY_CACHE["groups"] = groups
+    return groups
+
+
+@dataclass(slots=True)
+class _LibraryGroup:
+    """Mutable per-title accumulator for the library scan."""
+
+    episodes: list[int] = field(default_factory=list)
+    files_by_episode: dict[str, dict] = field(default_factory=dict)
+    latest_mtime: float = 0.0
+
+
+def _build_library_groups() -> list[dict]:
     history_items = latest_history(limit=300)
     poster_by_title: dict[str, str] = {}
     image_by_title: dict[str, str] = {}
     for entry in history_items:
         details = entry.get("details") or {}
         anime = str(details.get("anime") or "").strip()
-        image_url = str(details.get("image_url") or "").strip()
+        image_url = client_image_url(details.get("image_url"))
         poster_url = str(details.get("poster_url") or "").strip()
         if anime and poster_url and anime not in poster_by_title:
             poster_by_title[anime] = poster_url
         if anime and image_url and anime not in image_by_title:
             image_by_title[anime] = image_url
 
-    groups: dict[str, dict] = {}
-    for item in DOWNLOAD_DIR.iterdir():
-        if not item.is_file() or item.suffix.lower() not in VIDEO_EXTENSIONS:
-            continue
-
-        stem = item.stem
-        match = EPISODE_NAME_RE.match(stem)
-        if match:
-            title = match.group("title").strip()
-            episode = int(match.group("ep"))
-        else:
-            title = stem
-            episode = 1
-
-        group = groups.setdefault(
-            title,
-            {
-                "title": title,
-                "downloaded_episodes": [],
-                "files_by_episode": {},
-                "latest_mtime": 0.0,
-            },
+    groups: dict[str, _LibraryGroup] = {}
+    with os.scandir(DOWNLOAD_DIR) as entries:
+        for entry in entries:
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            stem, ext = os.path.splitext(entry.name)
+            if ext.lower() not in VIDEO_EXTENSIONS:
+                continue
+
+            split = split_episode_name(stem)
+            if split is not None:
+                title, episode = split
+            else:
+                title = stem
+                episode = 1
+
+            group = groups.get(title)
+            if group is None:
+                group = groups[title] = _LibraryGroup()
+            group.episodes.append(episode)
+            group.files_by_episode[str(episode)] = {
+                "filename": entry.name,
+                "media_url": "/media/" + urllib.parse.quote(entry.name),
+            }
+            group.latest_mtime = max(group.latest_mtime, entry.stat().st_mtime)
+
+    # Resolve missing posters in one parallel batch so a cold cache costs
+    # max(latency) rather than sum(latency) across titles.
+    titles_needing_poster = [title for title in groups if not poster_by_title.get(title)]
+    if titles_needing_poster:
+        fetched = COVER_POOL.map(
+            lambda t: ensure_local_poster(t, image_url=image_by_title.get(t, "")),
+            titles_needing_poster,
         )
-        group["downloaded_episodes"].append(episode)
-        group["files_by_episode"][str(episode)] = {
-            "filename": item.name,
-            "media_url": "/media/" + urllib.parse.quote(item.name),
-        }
-        group["latest_mtime"] = max(group["latest_mtime"], item.stat().st_mtime)
+        for title, poster_url in zip(titles_needing_poster, fetched):
+            if poster_url:
+                poster_by_title[title] = poster_url
 
     result: list[dict] = []
     for title, group in groups.items():
-        downloaded_sorted = sorted(set(int(ep) for ep in group["downloaded_episodes"]))
-        image_url = image_by_title.get(title, "")
-        poster_url = poster_by_title.get(title) or ensure_local_poster(title, image_url=image_url)
-        total_episodes = infer_total_episodes(title)
-        if total_episodes < (max(downloaded_sorted) if downloaded_sorted else 1):
-            total_episodes = max(downloaded_sorted) if downloaded_sorted else 1
+        downloaded_sorted = sorted(set(group.episodes))
+        poster_url = poster_by_title.get(title, "")
+        known_episodes = max(downloaded_sorted) if downloaded_sorted else 1
+        total_episodes = infer_total_episodes(
+            title, known_episodes=known_episodes, history_snapshot=history_items
+        )
+        if total_episodes < known_episodes:
+            total_episodes = known_episodes
 
         result.append(
             {
@@ -408,9 +911,9 @@ def list_library_groups() -> list[dict]:
                 "poster_url": poster_url,
                 "total_episodes": total_episodes,
                 "downloaded_episodes": downloaded_sorted,
-                "files_by_episode": group["files_by_episode"],
+                "files_by_episode": group.files_by_episode,
                 "downloaded_count": len(downloaded_sorted),
-                "latest_mtime": group["latest_mtime"],
+                "latest_mtime": group.latest_mtime,
             }
         )
 
@@ -419,10 +922,42 @@ def list_library_groups() -> list[dict]:
 
 
 class AniHandler(BaseHTTPRequestHandler):
+    # Flush small header writes immediately instead of waiting on Nagle.
+    disable_nagle_algorithm = True
+    # Keep-alive lets the browser reuse one connection for the poster
+    # barrage a library render triggers. Every non-streaming response sends
+    # Content-Length; paths that can't (SSE, unread POST bodies) close.
+    protocol_version = "HTTP/1.1"
+    # Drop idle keep-alive connections so they don't pin pool workers.
+    timeout = 60
+    # Buffer wfile so the header block and body leave in one send() per
+    # response (handle_one_request flushes after each request; the sendfile
+    # and SSE paths flush explicitly before taking over the socket).
+    wbufsize = 64 * 1024
+
+    def setup(self) -> None:
+        # A bigger send buffer gives the kernel more in-flight window for
+        # long media transfers.
+        with contextlib.suppress(OSError):
+            self.request.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
+        super().setup()
+
     def _send_json(self, status: int, data: dict) -> None:
-        raw = json.dumps(data).encode("utf-8")
+        self._send_json_bytes(status, json_dumps(data))
+
+    def _send_json_bytes(self, status: int, raw: bytes, extra_headers: dict[str, str] | None = None) -> None:
+        # Compress only payloads worth compressing; tiny responses would grow.
+        compress = len(raw) > 1024 and "gzip" in (self.headers.get("Accept-Encoding") or "")
+        if compress:
+            raw = gzip.compress(raw, compresslevel=4)
         self.send_response(status)
         self.send_header("Content-Type", "application/json; charset=utf-8")
+        # The body depends on Accept-Encoding; keep shared caches honest.
+        self.send_header("Vary", "Accept-Encoding")
+        if compress:
+            self.send_header("Content-Encoding", "gzip")
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
         self.send_header("Content-Length", str(len(raw)))
         self.end_headers()
         self.wfile.write(raw)
@@ -435,201 +970,367 @@ class AniHandler(BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(raw)
 
-    def _serve_static_file(self, filename: str, content_type: str) -> None:
-        target = (BASE_DIR / filename).resolve()
-        if target.parent != BASE_DIR.resolve() or not target.exists() or not target.is_file():
+    def _serve_static_file(self, filename: str) -> None:
+        cached = STATIC_CACHE.get(filename)
+        if cached is None:
             self.send_error(HTTPStatus.NOT_FOUND, "File not found")
             return
+        ctype, raw, raw_gz, etag = cached
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return
+        accept_gzip = "gzip" in (self.headers.get("Accept-Encoding") or "")
+        body = raw_gz if accept_gzip else raw
         self.send_response(HTTPStatus.OK)
-        self.send_header("Content-Type", content_type)
-        self.send_header("Content-Length", str(target.stat().st_size))
+        self.send_header("Content-Type", ctype)
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "public, max-age=60")
+        self.send_header("Vary", "Accept-Encoding")
+        if accept_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
         self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+    @staticmethod
+    def _parse_range(header: str, size: int) -> tuple[int, int] | None:
+        """Return (start, end) for a satisfiable single byte range, else None."""
+        match = RANGE_RE.fullmatch(header.strip())
+        if match is None:
+            return None
+        start_s, end_s = match.groups()
+        if start_s:
+            start = int(start_s)
+            end = int(end_s) if end_s else size - 1
+        elif end_s:
+            start = max(size - int(end_s), 0)
+            end = size - 1
+        else:
+            return None
+        if start >= size or end < start:
+            return None
+        return start, min(end, size - 1)
+
+    def _stream_file(self, target: Path, count: int, offset: int = 0) -> None:
+        """Send `count` bytes from `offset`, using sendfile(2) when available."""
         try:
             with target.open("rb") as f:
-                while True:
-                    chunk = f.read(64 * 1024)
-                    if not chunk:
-                        break
-                    self.wfile.write(chunk)
+                sent_total = 0
+                try:
+                    self.wfile.flush()
+                    out_fd = self.connection.fileno()
+                    while sent_total < count:
+                        sent = os.sendfile(out_fd, f.fileno(), offset + sent_total, count - sent_total)
+                        if sent == 0:
+                            break
+                        sent_total += sent
+                    return
+                except (AttributeError, OSError):
+                    # Only fall back if nothing was sent yet; a partial
+                    # sendfile followed by a restart would corrupt the body.
+                    if sent_total:
+                        return
+                    f.seek(offset)
+                buf = _checkout_buffer()
+                try:
+                    view = memoryview(buf)
+                    remaining = count
+                    while remaining > 0:
+                        n = f.readinto(view[: min(MEDIA_CHUNK, remaining)])
+                        if not n:
+                            break
+                        self.wfile.write(view[:n])
+                        remaining -= n
+                finally:
+                    _BUF_POOL.put(buf)
         except (BrokenPipeError, ConnectionResetError):
             return
 
+    @staticmethod
+    def _safe_name(filename: str) -> str | None:
+        """Unquoted filename if it's a plain name, None if it smells of traversal."""
+        name = urllib.parse.unquote(filename)
+        if not name or "/" in name or "\\" in name or ".." in name or "\x00" in name:
+            return None
+        return name
+
     def _serve_media(self, filename: str) -> None:
-        safe_name = Path(urllib.parse.unquote(filename)).name
-        target = (DOWNLOAD_DIR / safe_name).resolve()
-        if target.parent != DOWNLOAD_DIR.resolve() or not target.exists() or not target.is_file():
+        safe_name = self._safe_name(filename)
+        if safe_name is None:
+            self.send_error(HTTPStatus.NOT_FOUND, "Media not found")
+            return
+        target = DOWNLOAD_ROOT / safe_name
+        # One stat covers existence, regular-file check and size.
+        try:
+            st = target.stat()
+        except OSError:
+            st = None
+        if st is None or not stat.S_ISREG(st.st_mode):
             self.send_error(HTTPStatus.NOT_FOUND, "Media not found")
             return
 
-        ctype, _ = mimetypes.guess_type(str(target))
-        if not ctype:
-            ctype = "application/octet-stream"
+        ctype = mime_for_suffix(target.suffix.lower(), "application/octet-stream")
+
+        size = st.st_size
+        range_header = self.headers.get("Range")
+        if range_header:
+            byte_range = self._parse_range(range_header, size)
+            if byte_range is None:
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            start, end = byte_range
+            self.send_response(HTTPStatus.PARTIAL_CONTENT)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            self.send_header("Content-Length", str(end - start + 1))
+            self.send_header("Accept-Ranges", "bytes")
+            self.end_headers()
+            self._stream_file(target, end - start + 1, offset=start)
+            return
 
         self.send_response(HTTPStatus.OK)
         self.send_header("Content-Type", ctype)
-        self.send_header("Content-Length", str(target.stat().st_size))
+        self.send_header("Content-Length", str(size))
         self.send_header("Accept-Ranges", "bytes")
         self.end_headers()
-        try:
-            with target.open("rb") as f:
-                while True:
-                    chunk = f.read(64 * 1024)
-                    if not chunk:
-                        break
-                    self.wfile.write(chunk)
-        except (BrokenPipeError, ConnectionResetError):
-            return
+        self._stream_file(target, size)
 
     def _serve_poster(self, filename: str) -> None:
-        safe_name = Path(urllib.parse.unquote(filename)).name
-        target = (POSTER_DIR / safe_name).resolve()
-        if target.parent != POSTER_DIR.resolve() or not target.exists() or not target.is_file():
+        safe_name = self._safe_name(filename)
+        if safe_name is None:
+            self.send_error(HTTPStatus.NOT_FOUND, "Poster not found")
+            return
+        target = POSTER_ROOT / safe_name
+        try:
+            st = target.stat()
+        except OSError:
+            st = None
+        if st is None or not stat.S_ISREG(st.st_mode):
             self.send_error(HTTPStatus.NOT_FOUND, "Poster not found")
             return
 
-        ctype, _ = mimetypes.guess_type(str(target))
-        if not ctype:
-            ctype = "image/jpeg"
+        ctype = mime_for_suffix(target.suffix.lower(), "image/jpeg")
+
+        # Posters never change for a given filename, so let the browser keep
+        # them: size+mtime ETag, Last-Modified, and a day-long immutable TTL.
+        etag = f'"{st.st_size:x}-{int(st.st_mtime):x}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
 
         self.send_response(HTTPStatus.OK)
         self.send_header("Content-Type", ctype)
-        self.send_header("Content-Length", str(target.stat().st_size))
+        self.send_header("Content-Length", str(st.st_size))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", self.date_time_string(st.st_mtime))
+        self.send_header("Cache-Control", "public, max-age=86400, immutable")
+        self.end_headers()
+        self._stream_file(target, st.st_size)
+
+    def _send_event(self, data: bytes, event: str = "") -> None:
+        if event:
+            self.wfile.write(b"event: " + event.encode("ascii") + b"\n")
+        self.wfile.write(b"data: " + data + b"\n\n")
+        self.wfile.flush()
+
+    def _stream_search(self, query: str, mode: str) -> None:
+        """Emit search results over SSE as each cover lookup completes."""
+        # No Content-Length on an event stream; the socket closes when done.
+        self.close_connection = True
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
         self.end_headers()
         try:
-            with target.open("rb") as f:
-                while True:
-                    chunk = f.read(64 * 1024)
-                    if not chunk:
-                        break
-                    self.wfile.write(chunk)
+            if not query:
+                self._send_event(json_dumps({"error": "missing q"}), event="error")
+                return
+            try:
+                edges = _search_edges(query, mode)
+            except Exception as exc:
+                self._send_event(json_dumps({"error": f"search failed: {exc}"}), event="error")
+                return
+
+            def emit(index: int, result: AnimeResult, image_url: str) -> None:
+                self._send_event(
+                    json_dumps(
+                        {
+                            "index": index,
+                            "id": result.id,
+                            "name": result.name,
+                            "episodes": result.episodes,
+                            "image_url": image_url or NO_POSTER_URL,
+                        }
+                    )
+                )
+
+            # Results with an AllAnime thumbnail go out immediately; only the
+            # rest wait on a Jikan lookup.
+            pending = {}
+            for i, result in enumerate(edges, start=1):
+                if result.image_url:
+                    emit(i, result, result.image_url)
+                else:
+                    pending[COVER_POOL.submit(find_cover_image, result.name)] = (i, result)
+            for future in as_completed(pending):
+                index, result = pending[future]
+                try:
+                    image_url = future.result()
+                except Exception:
+                    image_url = ""
+                emit(index, result, image_url)
+            self._send_event(json_dumps({"count": len(edges)}), event="done")
         except (BrokenPipeError, ConnectionResetError):
             return
 
-    def do_GET(self) -> None:  # noqa: N802
-        parsed = urllib.parse.urlparse(self.path)
+    def _get_index(self, parsed) -> None:
+        self._serve_static_file("index.html")
 
-        if parsed.path == "/":
-            self._serve_static_file("index.html", "text/html; charset=utf-8")
-            return
+    def _get_style(self, parsed) -> None:
+        self._serve_static_file("style.css")
 
-        if parsed.path == "/style.css":
-            self._serve_static_file("style.css", "text/css; charset=utf-8")
-            return
+    def _get_script(self, parsed) -> None:
+        self._serve_static_file("script.js")
 
-        if parsed.path == "/script.js":
-            self._serve_static_file("script.js", "application/javascript; charset=utf-8")
+    def _api_search(self, parsed) -> None:
+        # parse_qsl keeps single-valued params as plain strings instead of
+        # allocating a one-element list per key.
+        params = dict(urllib.parse.parse_qsl(parsed.query))
+        query = params.get("q", "")
+        mode = params.get("mode", "dub").strip()
+        if mode not in {"dub", "sub"}:
+            mode = "dub"
+        # isspace() avoids allocating a stripped copy just to discard it.
+        if not query or query.isspace():
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "missing q"})
             return
+        query = query.strip()
 
-        if parsed.path.startswith("/media/"):
-            self._serve_media(parsed.path.replace("/media/", "", 1))
+        try:
+            results = search_anime(query, mode)
+        except Exception as exc:
+            self._send_json(HTTPStatus.BAD_GATEWAY, {"error": f"search failed: {exc}"})
             return
 
-        if parsed.path.startswith("/poster/"):
-            self._serve_poster(parsed.path.replace("/poster/", "", 1))
+        payload = {
+            "results": [
+                {
+                    "index": i,
+                    "id": r.id,
+                    "name": r.name,
+                    "episodes": r.episodes,
+                    "image_url": r.image_url,
+                }
+                for i, r in enumerate(results, start=1)
+            ]
+        }
+        raw = json_dumps(payload)
+        etag = f'"{hashlib.blake2b(raw, digest_size=16).hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.end_headers()
             return
+        self._send_json_bytes(
+            HTTPStatus.OK,
+            raw,
+            {"ETag": etag, "Cache-Control": "public, max-age=60"},
+        )
 
-        if parsed.path == "/api/search":
-            params = urllib.parse.parse_qs(parsed.query)
-            query = (params.get("q") or [""])[0].strip()
-            mode = (params.get("mode") or ["dub"])[0].strip()
-            if mode not in {"dub", "sub"}:
-                mode = "dub"
-            if not query:
-                self._send_json(HTTPStatus.BAD_REQUEST, {"error": "missing q"})
-                return
-
-            try:
-                results = search_anime(query, mode)
-            except Exception as exc:
-                self._send_json(HTTPStatus.BAD_GATEWAY, {"error": f"search failed: {exc}"})
-                return
-
-            payload = {
-                "results": [
-                    {
-                        "index": i,
-                        "id": r.id,
-                        "name": r.name,
-                        "episodes": r.episodes,
-                        "image_url": r.image_url,
-                    }
-                    for i, r in enumerate(results, start=1)
-                ]
-            }
-            self._send_json(HTTPStatus.OK, payload)
+    def _api_cover(self, parsed) -> None:
+        params = dict(urllib.parse.parse_qsl(parsed.query))
+        title = params.get("q", "").strip()
+        if not title:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "missing q"})
             return
+        self._send_json(HTTPStatus.OK, {"url": find_cover_image(title)})
 
-        if parsed.path == "/api/library":
-            self._send_json(HTTPStatus.OK, {"items": list_library_groups()})
-            return
+    def _api_search_stream(self, parsed) -> None:
+        params = dict(urllib.parse.parse_qsl(parsed.query))
+        query = params.get("q", "")
+        mode = params.get("mode", "dub").strip()
+        if mode not in {"dub", "sub"}:
+            mode = "dub"
+        self._stream_search("" if not query or query.isspace() else query.strip(), mode)
 
-        if parsed.path == "/api/history":
-            self._send_json(HTTPStatus.OK, {"items": history_summaries(limit=10)})
-            return
+    def _api_library(self, parsed) -> None:
+        raw = cached_api_payload("library", lambda: json_dumps({"items": list_library_groups()}))
+        self._send_json_bytes(HTTPStatus.OK, raw)
 
-        self._send_html(HTTPStatus.NOT_FOUND, "<h1>Not found</h1>")
+    def _api_history(self, parsed) -> None:
+        raw = cached_api_payload("history", lambda: json_dumps({"items": history_summaries(limit=10)}))
+        self._send_json_bytes(HTTPStatus.OK, raw)
 
-    def do_POST(self) -> None:  # noqa: N802
+    def do_GET(self) -> None:  # noqa: N802
         parsed = urllib.parse.urlparse(self.path)
-        if parsed.path not in {"/api/play_episode", "/api/download_season", "/api/history_event", "/api/download_all_by_title"}:
-            self._send_json(HTTPStatus.NOT_FOUND, {"error": "not found"})
-            return
-
-        length = int(self.headers.get("Content-Length") or "0")
-        raw = self.rfile.read(length)
-        try:
-            payload = json.loads(raw.decode("utf-8"))
-        except Exception:
-            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "invalid json"})
+        handler = self._GET_ROUTES.get(parsed.path)
+        if handler is not None:
+            handler(self, parsed)
             return
-
-        if parsed.path == "/api/download_all_by_title":
-            title = str(payload.get("title") or "").strip()
-            mode = str(payload.get("mode") or "dub").strip()
-            if mode not in {"dub", "sub"}:
-                mode = "dub"
-            image_url = str(payload.get("image_url") or "").strip()
-            if not title:
-                self._send_json(HTTPStatus.BAD_REQUEST, {"error": "title required"})
+        for prefix, prefix_handler in self._GET_PREFIXES:
+            if parsed.path.startswith(prefix):
+                prefix_handler(self, parsed.path[len(prefix):])
                 return
-            ok, msg, episodes = start_background_season_download_by_title(title=title, mode=mode)
-            if not ok:
-                self._send_json(HTTPStatus.BAD_REQUEST, {"error": msg})
-                return
-            poster_url = ensure_local_poster(title, image_url)
-            append_history(
-                "download_season",
-                {
-                    "anime": title,
-                    "query": title,
-                    "episodes": episodes,
-                    "image_url": image_url,
-                    "poster_url": poster_url,
-                },
-            )
-            self._send_json(HTTPStatus.OK, {"message": f"Download all started for {title} (1-{episodes})"})
-            return
+        self._send_html(HTTPStatus.NOT_FOUND, f"<h1>Not found</h1><p>{html_escape(parsed.path)}</p>")
 
-        if parsed.path == "/api/history_event":
-            anime_for_poster = str(payload.get("anime") or "").strip()
-            image_for_poster = str(payload.get("image_url") or "").strip()
-            poster_url = ensure_local_poster(anime_for_poster, image_for_poster) if anime_for_poster else ""
-            append_history(
-                str(payload.get("event") or "event"),
-                {
-                    "anime": anime_for_poster,
-                    "filename": str(payload.get("filename") or "").strip(),
-                    "query": str(payload.get("query") or "").strip(),
-                    "image_url": image_for_poster,
-                    "poster_url": poster_url,
-                },
-            )
-            self._send_json(HTTPStatus.OK, {"message": "history recorded"})
+    def _api_download_all_by_title(self, payload: dict) -> None:
+        title = str(payload.get("title") or "").strip()
+        mode = str(payload.get("mode") or "dub").strip()
+        if mode not in {"dub", "sub"}:
+            mode = "dub"
+        image_url = client_image_url(payload.get("image_url"))
+        if not title:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "title required"})
             return
+        ok, msg, episodes = start_background_season_download_by_title(title=title, mode=mode)
+        if not ok:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": msg})
+            return
+        poster_url = ensure_local_poster(title, image_url)
+        append_history(
+            "download_season",
+            {
+                "anime": title,
+                "query": title,
+                "episodes": episodes,
+                "image_url": image_url,
+                "poster_url": poster_url,
+            },
+        )
+        self._send_json(HTTPStatus.OK, {"message": f"Download all started for {title} (1-{episodes})"})
+
+    def _api_history_event(self, payload: dict) -> None:
+        anime_for_poster = str(payload.get("anime") or "").strip()
+        image_for_poster = client_image_url(payload.get("image_url"))
+        poster_url = ensure_local_poster(anime_for_poster, image_for_poster) if anime_for_poster else ""
+        append_history(
+            str(payload.get("event") or "event"),
+            {
+                "anime": anime_for_poster,
+                "filename": str(payload.get("filename") or "").strip(),
+                "query": str(payload.get("query") or "").strip(),
+                "image_url": image_for_poster,
+                "poster_url": poster_url,
+            },
+        )
+        self._send_json(HTTPStatus.OK, {"message": "history recorded"})
 
+    def _parse_episode_request(self, payload: dict) -> tuple[str, str, str, str, int] | None:
+        """Validate the fields shared by play/download requests, or answer 400."""
         query = str(payload.get("query") or "").strip()
         anime = str(payload.get("anime") or query).strip()
-        image_url = str(payload.get("image_url") or "").strip()
+        image_url = client_image_url(payload.get("image_url"))
         mode = str(payload.get("mode") or "dub").strip()
         if mode not in {"dub", "sub"}:
             mode = "dub"
@@ -637,98 +1338,183 @@ class AniHandler(BaseHTTPRequestHandler):
             index = int(payload.get("index"))
         except Exception:
             self._send_json(HTTPStatus.BAD_REQUEST, {"error": "invalid index"})
-            return
-
+            return None
         if not query:
             self._send_json(HTTPStatus.BAD_REQUEST, {"error": "query required"})
-            return
+            return None
         if index < 1:
             self._send_json(HTTPStatus.BAD_REQUEST, {"error": "index must be >= 1"})
+            return None
+        return query, anime, image_url, mode, index
+
+    def _api_play_episode(self, payload: dict) -> None:
+        fields = self._parse_episode_request(payload)
+        if fields is None:
+            return
+        query, anime, image_url, mode, index = fields
+        try:
+            episode = int(payload.get("episode"))
+        except Exception:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "invalid episode"})
+            return
+        if episode < 1:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "episode must be >= 1"})
             return
 
-        if parsed.path == "/api/play_episode":
-            try:
-                episode = int(payload.get("episode"))
-            except Exception:
-                self._send_json(HTTPStatus.BAD_REQUEST, {"error": "invalid episode"})
-                return
-            if episode < 1:
-                self._send_json(HTTPStatus.BAD_REQUEST, {"error": "episode must be >= 1"})
-                return
+        with DOWNLOAD_SEM:
+            ok, msg, media_file = download_episode_for_browser(query, mode, index, episode)
+        if not ok or media_file is None:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": msg})
+            return
 
-            with DOWNLOAD_LOCK:
-                ok, msg, media_file = download_episode_for_browser(query, mode, index, episode)
-            if not ok or media_file is None:
-                self._send_json(HTTPStatus.BAD_REQUEST, {"error": msg})
-                return
+        media_name = media_file.name
+        media_url = "/media/" + urllib.parse.quote(media_name)
+        poster_url = ensure_local_poster(anime or query, image_url)
+        append_history(
+            "play_episode",
+            {
+                "anime": anime or query,
+                "query": query,
+                "episode": episode,
+                "filename": media_name,
+                "image_url": image_url,
+                "poster_url": poster_url,
+            },
+        )
+        self._send_json(
+            HTTPStatus.OK,
+            {"message": msg, "filename": media_name, "media_url": media_url, "episode": episode},
+        )
 
-            media_name = media_file.name
-            media_url = "/media/" + urllib.parse.quote(media_name)
-            poster_url = ensure_local_poster(anime or query, image_url)
-            append_history(
-                "play_episode",
-                {
-                    "anime": anime or query,
-                    "query": query,
-                    "episode": episode,
-                    "filename": media_name,
-                    "image_url": image_url,
-                    "poster_url": poster_url,
-                },
-            )
-            self._send_json(
-                HTTPStatus.OK,
-                {"message": msg, "filename": media_name, "media_url": media_url, "episode": episode},
-            )
+    def _api_download_season(self, payload: dict) -> None:
+        fields = self._parse_episode_request(payload)
+        if fields is None:
+            return
+        query, anime, image_url, mode, index = fields
+        try:
+            episodes = int(payload.get("episodes"))
+        except Exception:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "invalid episodes"})
+            return
+        if episodes < 1:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "episodes must be >= 1"})
             return
 
-        if parsed.path == "/api/download_season":
-            try:
-                episodes = int(payload.get("episodes"))
-            except Exception:
-                self._send_json(HTTPStatus.BAD_REQUEST, {"error": "invalid episodes"})
-                return
-            if episodes < 1:
-                self._send_json(HTTPStatus.BAD_REQUEST, {"error": "episodes must be >= 1"})
-                return
+        ok, msg = start_background_season_download(query, mode, index, episodes)
+        if not ok:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": msg})
+            return
+        poster_url = ensure_local_poster(anime or query, image_url)
+        append_history(
+            "download_season",
+            {
+                "anime": anime or query,
+                "query": query,
+                "episodes": episodes,
+                "image_url": image_url,
+                "poster_url": poster_url,
+            },
+        )
+        self._send_json(HTTPStatus.OK, {"message": msg})
 
-            ok, msg = start_background_season_download(query, mode, index, episodes)
-            if not ok:
-                self._send_json(HTTPStatus.BAD_REQUEST, {"error": msg})
-                return
-            poster_url = ensure_local_poster(anime or query, image_url)
-            append_history(
-                "download_season",
-                {
-                    "anime": anime or query,
-                    "query": query,
-                    "episodes": episodes,
-                    "image_url": image_url,
-                    "poster_url": poster_url,
-                },
-            )
-            self._send_json(HTTPStatus.OK, {"message": msg})
+    def do_POST(self) -> None:  # noqa: N802
+        parsed = urllib.parse.urlparse(self.path)
+        handler = self._POST_ROUTES.get(parsed.path)
+        if handler is None:
+            # Body left unread, so the connection can't be reused.
+            self.close_connection = True
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "not found"})
+            return
+
+        length = int(self.headers.get("Content-Length") or "0")
+        if length > 1 << 20:
+            self.close_connection = True
+            self._send_json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "body too large"})
             return
+        raw = self.rfile.read(length)
+        try:
+            payload = json_loads(raw)
+        except Exception:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "invalid json"})
+            return
+        handler(self, payload)
+
+    _GET_ROUTES = {
+        "/": _get_index,
+        "/style.css": _get_style,
+        "/script.js": _get_script,
+        "/api/search": _api_search,
+        "/api/cover": _api_cover,
+        "/api/search/stream": _api_search_stream,
+        "/api/library": _api_library,
+        "/api/history": _api_history,
+    }
+    _GET_PREFIXES = (("/media/", _serve_media), ("/poster/", _serve_poster))
+    _POST_ROUTES = {
+        "/api/play_episode": _api_play_episode,
+        "/api/download_season": _api_download_season,
+        "/api/history_event": _api_history_event,
+        "/api/download_all_by_title": _api_download_all_by_title,
+    }
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer that handles requests on a bounded worker pool.
+
+    ThreadingHTTPServer spawns an unbounded thread per connection; a fixed
+    pool keeps thread-create overhead and GIL contention predictable under
+    burst traffic.
+    """
+
+    def __init__(self, server_address, handler_class, max_workers: int = 16):
+        super().__init__(server_address, handler_class)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="http")
+
+    def process_request(self, request, client_address) -> None:
+        self._executor.submit(self._process_request_pooled, request, client_address)
+
+    def _process_request_pooled(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._executor.shutdown(wait=False)
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="ani-cli web UI")
     parser.add_argument("--host", default="0.0.0.0", help="bind host")
     parser.add_argument("--port", type=int, default=9119, help="bind port (default: 9119)")
+    parser.add_argument("--workers", type=int, default=16, help="request handler threads (default: 16)")
     return parser.parse_args()
 
 
+def _warm_dns() -> None:
+    # Pre-resolve the upstream hosts so the first search after startup
+    # doesn't pay the DNS lookup; failures just mean a cold first call.
+    for host in ("api.allanime.day", "api.jikan.moe"):
+        with contextlib.suppress(OSError):
+            socket.getaddrinfo(host, 443)
+
+
 def main() -> int:
     args = parse_args()
+    threading.Thread(target=_warm_dns, daemon=True).start()
     print(f"Serving ani-cli web UI at http://{args.host}:{args.port}")
     print(f"Download directory: {DOWNLOAD_DIR}")
-    server = ThreadingHTTPServer((args.host, args.port), AniHandler)
+    server = PooledHTTPServer((args.host, args.port), AniHandler, max_workers=args.workers)
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         pass
     finally:
         server.server_close()
+        flush_history()
     return 0
 
 
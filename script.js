@@ -148,7 +148,7 @@ function render(items) {
     const card = document.createElement('div');
     card.className = 'card';
     const title = esc(item.name);
-    const imageUrl = item.image_url ? esc(item.image_url) : 'https://placehold.co/600x900?text=No+Poster';
+    const imageUrl = esc(item.image_url);
 
     card.innerHTML = `
       <div class="poster-wrap" role="button" tabindex="0">
@@ -268,6 +268,8 @@ historyToggleEl.onclick = () => {
   historyToggleEl.textContent = collapsed ? 'Show' : 'Hide';
 };
 
+let searchStream = null;
+
 async function doSearch() {
   const q = queryEl.value.trim();
   if (!q) {
@@ -278,18 +280,31 @@ async function doSearch() {
   setLoading(true, 'Searching...');
   resultsEl.innerHTML = '';
 
-  try {
-    const params = new URLSearchParams({q, mode: modeEl.value});
-    const resp = await fetch('/api/search?' + params.toString());
-    const data = await resp.json();
-    if (!resp.ok) throw new Error(data.error || 'search failed');
-    render(data.results || []);
-    setStatus(`Found ${(data.results || []).length} result(s). Click a poster to pick episodes.`);
-  } catch (err) {
-    setStatus(`Error: ${err.message}`);
-  } finally {
+  if (searchStream) searchStream.close();
+  const params = new URLSearchParams({q, mode: modeEl.value});
+  const stream = new EventSource('/api/search/stream?' + params.toString());
+  searchStream = stream;
+  const items = [];
+
+  stream.onmessage = (e) => {
+    items.push(JSON.parse(e.data));
+    items.sort((a, b) => a.index - b.index);
+    render(items);
+    setStatus(`Found ${items.length} result(s) so far...`);
+  };
+  stream.addEventListener('done', () => {
+    stream.close();
+    render(items);
+    setStatus(`Found ${items.length} result(s). Click a poster to pick episodes.`);
     setLoading(false);
-  }
+  });
+  stream.addEventListener('error', (e) => {
+    stream.close();
+    let message = 'search failed';
+    try { message = JSON.parse(e.data).error || message; } catch { /* connection error */ }
+    setStatus(`Error: ${message}`);
+    setLoading(false);
+  });
 }
 
 async function loadLibrary() {